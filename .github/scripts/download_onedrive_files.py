@@ -3,22 +3,96 @@
 
 import os
 import sys
+import base64
+import functools
+import hashlib
+import logging
+import shutil
 import time
 import random
 import requests
-import urllib.parse
-import re
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def get_direct_download_url(share_url):
+# Files to sync: (environment variable holding the share URL, output path, label)
+DOWNLOADS = [
+    ("IPQC_PEEL_STRENGTH_URL", "data/IPQC_Peel_Strength.xlsx", "IPQC Peel Strength"),
+]
+
+# Set ONEDRIVE_DEBUG=1 to log URLs and response headers
+DEBUG = os.environ.get("ONEDRIVE_DEBUG") == "1"
+
+# Set FORCE_DOWNLOAD=true to ignore stored ETags and always fetch the file
+FORCE_DOWNLOAD = os.environ.get("FORCE_DOWNLOAD", "").lower() == "true"
+
+log = logging.getLogger(__name__)
+
+# Share URL host markers
+_PERSONAL = "1drv.ms"
+_LIVE_HOST = "onedrive.live.com"
+_BUSINESS_HOSTS = ("sharepoint.com", _LIVE_HOST)
+
+# Random source for cache busters
+_RAND = random.Random()
+
+# Upper bound on files downloaded at the same time
+MAX_PARALLEL_DOWNLOADS = 5
+
+# Files larger than this are split into parallel HTTP Range requests
+RANGE_MIN_SIZE = 4 * 1024 * 1024
+RANGE_MAX_CONCURRENCY = 8
+
+# Bytes read from the network and written to disk per iteration
+CHUNK_SIZE = 1 << 20
+
+# Content types of login/error pages served in place of the file
+ERROR_PAGE_TYPES = ('text/html', 'text/plain', 'application/json')
+
+# download_file results (False means the download failed)
+DOWNLOADED = "downloaded"
+NOT_MODIFIED = "not_modified"
+
+# Browser-like headers with cache prevention, sent on every request
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': '*/*',
+    'Cache-Control': 'no-cache, no-store, must-revalidate',
+    'Pragma': 'no-cache',
+    'Expires': '0'
+}
+
+def create_session():
     """
-    Convert a OneDrive share URL to a direct download URL with aggressive cache busting.
+    Create a shared HTTP session so every request reuses pooled keep-alive connections.
     """
-    # Add timestamp and random string to avoid caching
-    timestamp = int(time.time())
-    random_str = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=8))
-    cache_buster = f"{timestamp}-{random_str}"
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    # Transient server errors are retried on the pooled connection
+    retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
 
-    print(f"Processing share URL: {share_url}")
+def add_cache_buster(url):
+    """
+    Append a timestamp and random string to a URL to defeat caching.
+    """
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}cb={int(time.time())}-{_RAND.getrandbits(40):010x}"
+
+@functools.lru_cache(maxsize=64)
+def get_direct_download_url(share_url, session):
+    """
+    Convert a OneDrive share URL to a direct download URL.
+
+    The result only depends on the share URL, so it is cached and retries don't repeat
+    the redirect lookup. Network and HTTP errors propagate (and are not cached) so the
+    caller can fall back to the original URL and resolve again on the next attempt.
+    """
+    log.debug("Processing share URL: %s", share_url)
 
     # Clean the URL first (remove any existing parameters)
     if '?' in share_url:
@@ -27,261 +101,480 @@ def get_direct_download_url(share_url):
         base_url = share_url
 
     # Try to determine if it's a OneDrive personal or business link
-    if "1drv.ms" in share_url:
+    if _PERSONAL in share_url:
         # For personal OneDrive short links (1drv.ms)
-        print("Detected OneDrive personal short link")
-        try:
-            # Set headers to mimic a browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0'
-            }
-
-            # First do a request to get the redirect URL
-            response = requests.get(share_url, headers=headers, allow_redirects=True)
-            redirect_url = response.url
-            print(f"Redirected to: {redirect_url}")
-
-            # Convert the redirected URL to a direct download URL
-            if "onedrive.live.com" in redirect_url:
-                # Replace view parameters with download
-                if "view.aspx" in redirect_url:
-                    direct_url = redirect_url.replace("view.aspx", "download.aspx")
-                else:
-                    direct_url = redirect_url
-
-                # Add download parameter and cache buster
-                if "?" in direct_url:
-                    direct_url = f"{direct_url}&download=1&cb={cache_buster}"
-                else:
-                    direct_url = f"{direct_url}?download=1&cb={cache_buster}"
-
-                print(f"Created direct URL: {direct_url}")
-                return direct_url
-        except Exception as e:
-            print(f"Error resolving 1drv.ms URL: {e}")
-            return None
+        log.debug("Detected OneDrive personal short link")
+
+        # Follow the redirect chain with HEAD so no body is transferred
+        response = session.head(share_url, allow_redirects=True, timeout=30)
+        if response.status_code >= 400:
+            # Server rejected HEAD; a streamed GET stops after the headers
+            response = session.get(share_url, stream=True, allow_redirects=True, timeout=30)
+            response.close()
+            # Raise on HTTP errors too, so a throttled or missing link isn't cached
+            response.raise_for_status()
+        redirect_url = response.url
+        log.debug("Redirected to: %s", redirect_url)
+
+        # Convert the redirected URL to a direct download URL
+        if _LIVE_HOST in redirect_url:
+            # Replace view parameters with download
+            if "view.aspx" in redirect_url:
+                direct_url = redirect_url.replace("view.aspx", "download.aspx")
+            else:
+                direct_url = redirect_url
 
-    elif "sharepoint.com" in share_url or "onedrive.live.com" in share_url:
-        # For OneDrive business or regular OneDrive links
-        print("Detected OneDrive business or regular link")
-        try:
-            # Create direct URL with cache buster
-            direct_url = f"{base_url}?download=1&cb={cache_buster}"
-            print(f"Created direct URL: {direct_url}")
+            # Add download parameter
+            if "?" in direct_url:
+                direct_url = f"{direct_url}&download=1"
+            else:
+                direct_url = f"{direct_url}?download=1"
+
+            log.debug("Created direct URL: %s", direct_url)
             return direct_url
-        except Exception as e:
-            print(f"Error creating direct URL: {e}")
-            return None
 
-    # If we couldn't determine the type, add cache buster to original URL
-    print("Unknown URL type, adding cache buster to original URL")
-    return f"{base_url}?cb={cache_buster}"
+    elif any(host in share_url for host in _BUSINESS_HOSTS):
+        # For OneDrive business or regular OneDrive links
+        direct_url = f"{base_url}?download=1"
+        log.debug("Detected OneDrive business or regular link")
+        log.debug("Created direct URL: %s", direct_url)
+        return direct_url
+
+    # If we couldn't determine the type, use the original URL without parameters
+    log.debug("Unknown URL type, using original URL")
+    return base_url
+
+class HashingWriter:
+    """File wrapper that feeds every chunk written through it to a hash object."""
+
+    def __init__(self, f, hasher):
+        self.f = f
+        self.hasher = hasher
+
+    def write(self, data):
+        self.hasher.update(data)
+        return self.f.write(data)
+
+def warn_if_not_excel(content_type):
+    """Log a warning if the content type isn't Excel or a generic binary type."""
+    if not (
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' in content_type or
+        'application/vnd.ms-excel' in content_type or
+        'application/octet-stream' in content_type or
+        'application/binary' in content_type
+    ):
+        log.warning("Content type doesn't look like Excel: %s", content_type)
+        # Continue anyway - sometimes content type is misreported
+
+def preallocate(fd, size):
+    """
+    Reserve disk space for a file of known size in one contiguous allocation.
+    Falls back to extending the file where fallocate isn't supported.
+    """
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        os.ftruncate(fd, size)
 
-def download_file(url, output_path):
+def download_file_ranged(session, url, output_path, total_size, validator,
+                         max_concurrency=RANGE_MAX_CONCURRENCY):
+    """
+    Download a large file as concurrent HTTP Range requests, each written into its own
+    slice of a preallocated output file.
+
+    total_size and validator (the ETag, or Last-Modified if there is none) come from a
+    GET response for the same URL. Every range is sent with If-Range, so if the file
+    changed since then the server answers 200 instead of 206 and no mix of two versions
+    is written. Each 206 must also carry the exact Content-Range that was requested.
+
+    Returns True on success, or False if the server didn't honor the ranges (the caller
+    should fall back to a normal GET).
+    """
+    part_size = -(-total_size // max_concurrency)
+    ranges = [
+        (start, min(start + part_size, total_size) - 1)
+        for start in range(0, total_size, part_size)
+    ]
+    log.info("Downloading %d bytes as %d parallel ranges", total_size, len(ranges))
+
+    # Byte ranges are offsets into the unencoded file, so ask for it uncompressed
+    base_headers = {'Accept-Encoding': 'identity', 'If-Range': validator}
+
+    # The local copy is about to change, so its stored ETag no longer applies
+    save_etag(output_path, None)
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        preallocate(fd, total_size)
+
+        def fetch_range(byte_range):
+            start, end = byte_range
+            range_headers = dict(base_headers, Range=f"bytes={start}-{end}")
+            with session.get(url, headers=range_headers, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    # Server ignored the Range header, or the file changed (If-Range)
+                    log.debug("Range request returned %s, expected 206", response.status_code)
+                    return False
+
+                # A coalesced or shifted range would overwrite neighbouring slices
+                content_range = response.headers.get('Content-Range', '')
+                if content_range not in (f"bytes {start}-{end}/{total_size}",
+                                         f"bytes {start}-{end}/*"):
+                    log.debug("Range %d-%d answered with Content-Range %r", start, end, content_range)
+                    return False
+
+                offset = start
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        if offset + len(chunk) > end + 1:
+                            log.debug("Range %d-%d returned more bytes than requested", start, end)
+                            return False
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+
+            if offset != end + 1:
+                raise IOError(f"Incomplete range {start}-{end}: got {offset - start} bytes")
+            return True
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            results = list(executor.map(fetch_range, ranges))
+    finally:
+        os.close(fd)
+
+    if not all(results):
+        log.info("Range requests not honored, falling back to sequential download")
+        return False
+
+    log.debug("Ranged download complete: %d bytes", total_size)
+    return True
+
+def download_file(url, output_path, session):
     """
     Download a file from a URL to the specified path with improved error handling and reporting.
+
+    Returns DOWNLOADED, NOT_MODIFIED if the server confirmed the local copy is current,
+    or False on failure.
     """
-    print(f"\n=== Downloading from: {url}")
-    print(f"To: {output_path}")
+    log.info("=== Downloading %s", output_path)
+    log.debug("Share URL: %s", url)
+
+    # Ask the server to skip the body if the local copy is still current,
+    # unless a forced download was requested
+    conditional_headers = {}
+    previous_etag = None if FORCE_DOWNLOAD else read_etag(output_path)
+    if previous_etag:
+        conditional_headers['If-None-Match'] = previous_etag
+        log.debug("Previous ETag: %s", previous_etag)
 
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            direct_url = get_direct_download_url(url)
-            if not direct_url:
-                print(f"Warning: Could not create direct URL, using original URL")
+            try:
+                direct_url = get_direct_download_url(url, session)
+            except requests.RequestException as e:
+                log.warning("Could not create direct URL (%s), using original URL", e)
                 direct_url = url
+            direct_url = add_cache_buster(direct_url)
 
-            print(f"Using direct URL (attempt {attempt+1}/{max_retries}): {direct_url}")
-
-            # Make the request with a custom User-Agent and cache prevention
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': '*/*',
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0'
-            }
+            log.debug("Using direct URL (attempt %d/%d): %s", attempt + 1, max_retries, direct_url)
 
-            # Use a session to maintain cookies and other state
-            session = requests.Session()
-
-            # First make a HEAD request to check content type and size
-            head_response = session.head(direct_url, headers=headers, timeout=30)
-            print(f"HEAD response status: {head_response.status_code}")
-            print(f"HEAD response headers: {dict(head_response.headers)}")
-
-            # Now make the GET request
-            response = session.get(direct_url, headers=headers, stream=True, timeout=30)
+            # Content type and size are read from the GET response headers
+            response = session.get(
+                direct_url, headers=conditional_headers, stream=True, timeout=30
+            )
             response.raise_for_status()
 
+            if response.status_code == 304:
+                response.close()
+                log.info("%s is up to date (304 Not Modified)", output_path)
+                return NOT_MODIFIED
+
             # Debug response
-            print(f"GET response status: {response.status_code}")
-            print(f"GET response headers: {dict(response.headers)}")
+            log.debug("GET response status: %s", response.status_code)
+            log.debug("GET response headers: %s", response.headers)
 
             # Get the content length if available
             total_size = int(response.headers.get('content-length', 0))
-            print(f"Content length: {total_size} bytes")
+            log.debug("Content length: %d bytes", total_size)
 
             # Get content type
             content_type = response.headers.get('content-type', '')
-            print(f"Content type: {content_type}")
-
-            # Verify it's Excel or a binary file
-            if not (
-                'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' in content_type or
-                'application/vnd.ms-excel' in content_type or
-                'application/octet-stream' in content_type or
-                'application/binary' in content_type
+            log.debug("Content type: %s", content_type)
+
+            # Large files on servers that accept byte ranges are fetched as parallel
+            # pieces instead of through this response. Compressed bodies are excluded
+            # because their Content-Length isn't the size of the file on disk, and
+            # text bodies because they are never the file being synced. If-Range
+            # needs a validator, so responses without ETag or Last-Modified are
+            # excluded too.
+            validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            ranged = False
+            if (
+                total_size > RANGE_MIN_SIZE and
+                validator and
+                not content_type.startswith(ERROR_PAGE_TYPES) and
+                response.headers.get('accept-ranges', '').lower() == 'bytes' and
+                response.headers.get('content-encoding', 'identity') == 'identity'
             ):
-                print(f"WARNING: Content type doesn't look like Excel: {content_type}")
-                # Continue anyway - sometimes content type is misreported
-
-            # Save the file
-            downloaded_bytes = 0
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_bytes += len(chunk)
-                        # Print progress for large files
-                        if total_size > 0 and downloaded_bytes % (1024*1024) == 0:
-                            print(f"Downloaded {downloaded_bytes / (1024*1024):.2f} MB of {total_size / (1024*1024):.2f} MB")
+                warn_if_not_excel(content_type)
+                response.close()
+                # Use the final URL so every range request skips the redirect chain
+                ranged = download_file_ranged(session, response.url, output_path, total_size, validator)
+                if not ranged:
+                    # The local file was already truncated, so don't accept a 304 here
+                    response = session.get(direct_url, stream=True, timeout=30)
+                    response.raise_for_status()
+                    total_size = int(response.headers.get('content-length', 0))
+                    content_type = response.headers.get('content-type', '')
+                    log.debug("Fallback response headers: %s", response.headers)
+
+            if not ranged:
+                # Expired share links serve a small login/error page instead of the
+                # file; retry without overwriting the local copy with it
+                if content_type.startswith(ERROR_PAGE_TYPES) and total_size < 1 << 20:
+                    snippet = response.raw.read(512, decode_content=True)
+                    response.close()
+                    log.warning(
+                        "Server returned %s instead of the file: %s",
+                        content_type, snippet.decode('utf-8', 'replace')
+                    )
+                    # Back off like other failures so throttling pages get time to clear
+                    if attempt < max_retries - 1:
+                        log.info("Retrying in 5 seconds...")
+                        time.sleep(5)
+                        continue
+                    return False
+
+                warn_if_not_excel(content_type)
+
+                # Content-MD5 covers the body as sent, so it can only be checked
+                # against what we write when the body isn't compressed
+                expected_md5 = response.headers.get('Content-MD5')
+                if response.headers.get('Content-Encoding', 'identity') != 'identity':
+                    expected_md5 = None
+                hasher = hashlib.md5()
+
+                # Save the file; the copy loop runs in C. The buffered file object
+                # passes large chunks straight through and retries short writes.
+                # decode_content keeps gzip handling.
+                response.raw.decode_content = True
+                save_etag(output_path, None)
+                with open(output_path, 'wb') as f:
+                    if total_size > 0:
+                        preallocate(f.fileno(), total_size)
+                    shutil.copyfileobj(response.raw, HashingWriter(f, hasher), length=CHUNK_SIZE)
+                    # Content-Length is the encoded size, so trim to what was written
+                    f.truncate(f.tell())
 
             # Verify file size
             file_size = os.path.getsize(output_path)
-            print(f"Download complete. File size: {file_size} bytes")
+            log.info("Download complete. File size: %d bytes", file_size)
 
             if file_size == 0:
-                print(f"WARNING: Downloaded file is empty: {output_path}")
+                log.warning("Downloaded file is empty: %s", output_path)
                 if attempt < max_retries - 1:
-                    print(f"Retrying download...")
+                    log.info("Retrying download...")
                     continue
                 return False
 
-            # Basic Excel file signature check
-            with open(output_path, 'rb') as f:
-                header = f.read(4)
-                # XLSX files start with PK signature (zip file)
-                if not (header.startswith(b'PK') or header.startswith(b'\xd0\xcf\x11\xe0')):
-                    print(f"WARNING: File doesn't look like an Excel file. First bytes: {header.hex()}")
-                    # Continue anyway - it might be valid in some cases
+            # Verify integrity against the server-provided hash, computed while writing
+            if not ranged and expected_md5:
+                actual_md5 = base64.b64encode(hasher.digest()).decode('ascii')
+                if actual_md5 != expected_md5:
+                    log.warning("Content-MD5 mismatch: expected %s, got %s", expected_md5, actual_md5)
+                    if attempt < max_retries - 1:
+                        log.info("Retrying download...")
+                        continue
+                    return False
+                log.debug("Content-MD5 verified: %s", actual_md5)
 
-            print(f"Successfully downloaded {url} to {output_path}")
-            return True
+            save_etag(output_path, response.headers.get('ETag'))
+
+            log.info("Successfully downloaded %s", output_path)
+            return DOWNLOADED
 
         except Exception as e:
-            print(f"Error downloading file (attempt {attempt+1}/{max_retries}): {str(e)}")
+            log.error("Error downloading file (attempt %d/%d): %s", attempt + 1, max_retries, e)
             if attempt < max_retries - 1:
-                print(f"Retrying in 5 seconds...")
+                log.info("Retrying in 5 seconds...")
                 time.sleep(5)
             else:
                 return False
 
     return False
 
+def peek(path, n=8):
+    """Read the first n bytes of a file with a single open/pread/close."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.pread(fd, n, 0)
+    finally:
+        os.close(fd)
+
+def validate_one(path):
+    """
+    Return (name, size, is_valid, error) for a file in the data directory.
+
+    is_valid is True/False for Excel files depending on the ZIP signature, and None for
+    other files or when the header couldn't be read, in which case error holds the
+    exception. Nothing is logged here so results can be reported in one ordered pass.
+    """
+    name = os.path.basename(path)
+    size = os.path.getsize(path)
+    is_valid = None
+    error = None
+    if name.endswith('.xlsx'):
+        try:
+            is_valid = peek(path).startswith(b'PK')
+        except OSError as e:
+            error = e
+    return name, size, is_valid, error
+
+def read_etag(output_path):
+    """Return the ETag stored next to a previously downloaded file, if any."""
+    etag_path = f"{output_path}.etag"
+    if not (os.path.exists(output_path) and os.path.exists(etag_path)):
+        return None
+    with open(etag_path) as f:
+        return f.read().strip() or None
+
+def save_etag(output_path, etag):
+    """Store the ETag of a downloaded file, or remove a stale one if the server sent none."""
+    etag_path = f"{output_path}.etag"
+    if etag:
+        with open(etag_path, "w") as f:
+            f.write(etag)
+    elif os.path.exists(etag_path):
+        os.remove(etag_path)
+
 def force_changes():
     """Create a marker file to force Git to recognize changes"""
     marker_path = "data/.files_changed"
     with open(marker_path, "w") as f:
         f.write(f"Files updated at {time.time()}")
-    print(f"Created marker file at {marker_path}")
+    log.info("Created marker file at %s", marker_path)
 
 def main():
+    logging.basicConfig(
+        level=logging.DEBUG if DEBUG else logging.INFO,
+        format='%(asctime)s %(message)s'
+    )
+
     # Create data directory if it doesn't exist
     os.makedirs("data", exist_ok=True)
 
-    # Get IPQC OneDrive share URL from environment variable
-    ipqc_url = os.environ.get("IPQC_PEEL_STRENGTH_URL")
-
-    print("\n=== Starting IPQC OneDrive file download process ===")
-    print(f"Current directory: {os.getcwd()}")
-    print(f"Data directory: {os.path.abspath('data')}")
+    log.info("=== Starting IPQC OneDrive file download process ===")
+    log.info("Current directory: %s", os.getcwd())
+    log.info("Data directory: %s", os.path.abspath('data'))
 
     success = True
 
-    # Download IPQC Peel Strength Excel file
-    if ipqc_url:
-        print("\n=== Processing IPQC Peel Strength Test file ===")
-        result = download_file(ipqc_url, "data/IPQC_Peel_Strength.xlsx")
-        success = result and success
-        
-        if result:
-            print("✅ IPQC Peel Strength file downloaded successfully")
+    # Collect the files that have a share URL configured
+    jobs = []
+    for env_var, output_path, label in DOWNLOADS:
+        share_url = os.environ.get(env_var)
+        if share_url:
+            jobs.append((share_url, output_path, label))
         else:
-            print("❌ Failed to download IPQC Peel Strength file")
-    else:
-        print("WARNING: IPQC_PEEL_STRENGTH_URL environment variable not set")
-        success = False
-
-    # Always force changes to be recognized
-    force_changes()
-
-    print("\n=== Download process completed ===")
-    print(f"Overall success: {success}")
+            log.warning("%s environment variable not set", env_var)
+            success = False
 
-    # List files in data directory
-    print("\n=== Files in data directory ===")
+    # Download all files concurrently; the work is network-bound, so
+    # total time is the slowest file rather than the sum of all of them
+    if jobs:
+        log.info("=== Downloading %d file(s) ===", len(jobs))
+        with create_session() as session, \
+                ThreadPoolExecutor(max_workers=MAX_PARALLEL_DOWNLOADS) as executor:
+            results = list(executor.map(
+                lambda job: download_file(job[0], job[1], session), jobs
+            ))
+
+        for (_, _, label), result in zip(jobs, results):
+            success = bool(result) and success
+            if result == DOWNLOADED:
+                log.info("✅ %s file downloaded successfully", label)
+            elif result == NOT_MODIFIED:
+                log.info("✅ %s file is already up to date", label)
+            else:
+                log.error("❌ Failed to download %s file", label)
+    else:
+        results = []
+
+    # Only force changes to be recognized when a file was actually replaced
+    changed = DOWNLOADED in results
+    if changed:
+        force_changes()
+
+    # Tell the workflow whether anything changed, so unchanged runs skip the commit
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, "a") as f:
+            f.write(f"changed={'true' if changed else 'false'}\n")
+
+    log.info("=== Download process completed ===")
+    log.info("Overall success: %s", success)
+
+    # List and validate files in data directory; the checks are independent
+    # file reads, so they run concurrently and are reported in one pass
+    log.info("=== Files in data directory ===")
+    validation = {}
     try:
-        for file in os.listdir("data"):
-            file_path = os.path.join("data", file)
-            if os.path.isfile(file_path):
-                size = os.path.getsize(file_path)
-                print(f"{file}: {size} bytes")
-                
-                # Additional validation for Excel files
-                if file.endswith('.xlsx'):
-                    try:
-                        with open(file_path, 'rb') as f:
-                            header = f.read(8)
-                            if header.startswith(b'PK'):
-                                print(f"  ✅ {file} appears to be a valid Excel file")
-                            else:
-                                print(f"  ⚠️  {file} may not be a valid Excel file")
-                    except Exception as e:
-                        print(f"  ❌ Error validating {file}: {e}")
+        paths = [
+            os.path.join("data", file) for file in os.listdir("data")
+            if os.path.isfile(os.path.join("data", file))
+        ]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(validate_one, paths))
+
+        for path, result in zip(paths, results):
+            validation[path] = result
+            name, size, is_valid, error = result
+            log.info("%s: %d bytes", name, size)
+            if error is not None:
+                log.error("  ❌ Error validating %s: %s", name, error)
+            elif is_valid:
+                log.info("  ✅ %s appears to be a valid Excel file", name)
+            elif is_valid is False:
+                log.warning("  ⚠️  %s may not be a valid Excel file", name)
     except Exception as e:
-        print(f"Error listing data directory: {e}")
+        log.error("Error listing data directory: %s", e)
 
-    # Validate IPQC file specifically
+    # Validate IPQC file specifically, reusing the result from the listing
     ipqc_file_path = "data/IPQC_Peel_Strength.xlsx"
-    if os.path.exists(ipqc_file_path):
-        file_size = os.path.getsize(ipqc_file_path)
-        print(f"\n=== IPQC File Validation ===")
-        print(f"File exists: ✅")
-        print(f"File size: {file_size} bytes")
+    log.info("=== IPQC File Validation ===")
+    ipqc_result = validation.get(ipqc_file_path)
+    if ipqc_result is None and os.path.isfile(ipqc_file_path):
+        ipqc_result = validate_one(ipqc_file_path)
+
+    if ipqc_result:
+        _, file_size, is_valid, error = ipqc_result
+        log.info("File exists: ✅")
+        log.info("File size: %d bytes", file_size)
         
         if file_size > 0:
-            print(f"File size check: ✅")
+            log.info("File size check: ✅")
         else:
-            print(f"File size check: ❌ (File is empty)")
+            log.error("File size check: ❌ (File is empty)")
             success = False
             
         # Check if it's a valid Excel file
-        try:
-            with open(ipqc_file_path, 'rb') as f:
-                header = f.read(4)
-                if header.startswith(b'PK'):
-                    print(f"Excel format check: ✅")
-                else:
-                    print(f"Excel format check: ⚠️  (May not be valid Excel format)")
-        except Exception as e:
-            print(f"Excel format check: ❌ (Error reading file: {e})")
+        if error is not None:
+            log.error("Excel format check: ❌ (Error reading file: %s)", error)
+        elif is_valid:
+            log.info("Excel format check: ✅")
+        else:
+            log.warning("Excel format check: ⚠️  (May not be valid Excel format)")
     else:
-        print(f"\n=== IPQC File Validation ===")
-        print(f"File exists: ❌")
+        log.error("File exists: ❌")
         success = False
 
     # Exit with error code if any download failed
     if not success:
-        print("\n❌ Exiting with error code 1 due to download failures")
+        log.error("❌ Exiting with error code 1 due to download failures")
         sys.exit(1)
     else:
-        print("\n✅ All downloads successful")
-        print("🎉 IPQC data is ready for processing!")
+        log.info("✅ All downloads successful")
+        log.info("🎉 IPQC data is ready for processing!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file